@@ -17,6 +17,9 @@ conda activate streamer-sales
 # 配置 huggingface 国内镜像地址
 export HF_ENDPOINT="https://hf-mirror.com"
 
+# PyTorch 显存分配器使用可扩展段，减少显存碎片，避免反复 cudaMalloc
+export PYTORCH_CUDA_ALLOC_CONF="expandable_segments:True"
+
 case $1 in
     tts)
         echo "正在启动 TTS 服务..."
@@ -43,6 +46,8 @@ case $1 in
                                   --model-name internlm2 \
                                   --session-len 32768 \
                                   --cache-max-entry-count 0.1 \
+                                  --enable-prefix-caching \
+                                  --quant-policy 8 \
                                   --model-format hf
         ;;
 
@@ -55,6 +60,8 @@ case $1 in
                                   --model-name internlm2 \
                                   --session-len 32768 \
                                   --cache-max-entry-count 0.1 \
+                                  --enable-prefix-caching \
+                                  --quant-policy 8 \
                                   --model-format awq
         ;;
 
@@ -17,7 +17,7 @@ interface StreamerInfo {
   poster_image: string
   base_mp4_path: string
 
-  delete: boolean
+  deleted_at: string | null
 }
 
 // 获取后端主播信息
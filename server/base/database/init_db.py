@@ -12,6 +12,7 @@
 from loguru import logger
 from pydantic import PostgresDsn
 from pydantic_core import MultiHostUrl
+from sqlalchemy import text
 from sqlmodel import SQLModel, create_engine
 
 from ...web_configs import WEB_CONFIGS
@@ -39,6 +40,36 @@ logger.info(f"connecting to db: {str(sqlalchemy_db_url())}")
 DB_ENGINE = create_engine(str(sqlalchemy_db_url()), echo=ECHO_DB_MESG)
 
 
+# 已有数据库的表结构升级语句，create_all 对已存在的表不会做修改，需要在这里补齐，所有语句必须可重复执行
+DB_UPGRADE_SQL = [
+    # streamer_info: 删除标记 delete(bool) -> deleted_at(timestamp)，并改用只收录未删除行的部分索引
+    "ALTER TABLE streamer_info ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMP WITHOUT TIME ZONE",
+    """
+    DO $$
+    BEGIN
+        IF EXISTS (
+            SELECT 1 FROM information_schema.columns WHERE table_name = 'streamer_info' AND column_name = 'delete'
+        ) THEN
+            UPDATE streamer_info SET deleted_at = NOW() WHERE "delete" AND deleted_at IS NULL;
+            ALTER TABLE streamer_info DROP COLUMN "delete";
+        END IF;
+    END $$
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_streamer_live ON streamer_info (user_id) WHERE deleted_at IS NULL",
+    # chat_message_info: 保存实际发给 LLM 的内容
+    "ALTER TABLE chat_message_info ADD COLUMN IF NOT EXISTS llm_message VARCHAR",
+]
+
+
+def upgrade_db_schema():
+    """升级已有数据库的表结构，新建的数据库执行后无变化"""
+    with DB_ENGINE.begin() as conn:
+        for upgrade_sql in DB_UPGRADE_SQL:
+            conn.execute(text(upgrade_sql))
+    logger.info("db schema upgrade done!")
+
+
 def create_db_and_tables():
     """创建所有数据库和对应的表，有则跳过"""
     SQLModel.metadata.create_all(DB_ENGINE)
+    upgrade_db_schema()
@@ -9,14 +9,22 @@
 @Desc    :   大模型对话数据库交互
 """
 
+from pathlib import Path
+
 import yaml
 
 from ...web_configs import WEB_CONFIGS
 
+# 对话配置文件缓存，每轮对话都会用到，只在文件修改后才重新解析
+CONVERSATION_CFG_CACHE = {"mtime": None, "content": None}
+
 
 async def get_llm_product_prompt_base_info():
-    # 加载对话配置文件
-    with open(WEB_CONFIGS.CONVERSATION_CFG_YAML_PATH, "r", encoding="utf-8") as f:
-        dataset_yaml = yaml.safe_load(f)
+    # 加载对话配置文件，以文件修改时间作为缓存失效依据
+    cfg_mtime = Path(WEB_CONFIGS.CONVERSATION_CFG_YAML_PATH).stat().st_mtime
+    if CONVERSATION_CFG_CACHE["mtime"] != cfg_mtime:
+        with open(WEB_CONFIGS.CONVERSATION_CFG_YAML_PATH, "r", encoding="utf-8") as f:
+            CONVERSATION_CFG_CACHE["content"] = yaml.safe_load(f)
+        CONVERSATION_CFG_CACHE["mtime"] = cfg_mtime
 
-    return dataset_yaml
+    return CONVERSATION_CFG_CACHE["content"]
@@ -10,6 +10,7 @@
 """
 
 
+from datetime import datetime
 from typing import List
 
 from loguru import logger
@@ -32,7 +33,7 @@ async def get_db_streamer_info(user_id: int, streamer_id: int | None = None) ->
     """
 
     # 查询条件
-    query_condiction = and_(StreamerInfo.user_id == user_id, StreamerInfo.delete == False)
+    query_condiction = and_(StreamerInfo.user_id == user_id, StreamerInfo.deleted_at.is_(None))
 
     # 获取总数
     with Session(DB_ENGINE) as session:
@@ -42,7 +43,7 @@ async def get_db_streamer_info(user_id: int, streamer_id: int | None = None) ->
         if streamer_id is not None:
             # 查询条件更改为查找特定 ID
             query_condiction = and_(
-                StreamerInfo.user_id == user_id, StreamerInfo.delete == False, StreamerInfo.streamer_id == streamer_id
+                StreamerInfo.user_id == user_id, StreamerInfo.deleted_at.is_(None), StreamerInfo.streamer_id == streamer_id
             )
 
         # 查询主播商品，并根据 ID 进行排序
@@ -93,7 +94,7 @@ async def delete_streamer_id(streamer_id: int, user_id: int) -> bool:
                 logger.error("Delete by other ID !!!")
                 return False
 
-            streamer_info.delete = True  # 设置为删除
+            streamer_info.deleted_at = datetime.now()  # 设置为删除
             session.add(streamer_info)
             session.commit()  # 提交
     except Exception:
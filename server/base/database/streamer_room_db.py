@@ -219,7 +219,7 @@ def init_conversation(db_session, sales_info_id: int, streamer_id: int, sales_do
     db_session.add(message_info)
 
 
-def update_message_info(sales_info_id: int, role_id: int, role: str, message: str):
+def update_message_info(sales_info_id: int, role_id: int, role: str, message: str, llm_message: str | None = None):
     """新增对话记录
 
     Args:
@@ -227,6 +227,7 @@ def update_message_info(sales_info_id: int, role_id: int, role: str, message: st
         role_id (int): 角色 ID
         role (str): 角色类型："streamer", "user"
         message (str): 插入的消息
+        llm_message (str, optional): 实际发给 LLM 的消息，和 message 一致时为空
     """
 
     assert role in ["streamer", "user"]
@@ -237,7 +238,12 @@ def update_message_info(sales_info_id: int, role_id: int, role: str, message: st
         role_id_info = {role_key: role_id}
 
         message_info = ChatMessageInfo(
-            **role_id_info, sales_info_id=sales_info_id, role=role, message=message, send_time=datetime.now()
+            **role_id_info,
+            sales_info_id=sales_info_id,
+            role=role,
+            message=message,
+            llm_message=llm_message,
+            send_time=datetime.now(),
         )
         session.add(message_info)
         session.commit()
@@ -342,6 +348,7 @@ def get_message_list(sales_info_id: int) -> List[ChatMessageInfo]:
             "avatar": message_.user_info.avatar if message_.role == "user" else message_.streamer_info.avatar,
             "userName": message_.user_info.username if message_.role == "user" else message_.streamer_info.name,
             "message": message_.message,
+            "llm_message": message_.llm_message,
             "datetime": message_.send_time,
         }
 
@@ -9,7 +9,10 @@
 @Desc    :   主播信息数据结构
 """
 
+from datetime import datetime
 from typing import Optional
+
+from sqlalchemy import Index, text
 from sqlmodel import Field, Relationship, SQLModel
 
 
@@ -18,6 +21,8 @@ from sqlmodel import Field, Relationship, SQLModel
 # =======================================================
 class StreamerInfo(SQLModel, table=True):
     __tablename__ = "streamer_info"
+    # 按用户筛选未删除的主播是最常见的查询，使用部分索引只收录未删除的行
+    __table_args__ = (Index("ix_streamer_live", "user_id", postgresql_where=text("deleted_at IS NULL")),)
 
     streamer_id: int | None = Field(default=None, primary_key=True, unique=True)
     name: str = Field(index=True, unique=True)
@@ -31,7 +36,7 @@ class StreamerInfo(SQLModel, table=True):
     poster_image: str = ""
     base_mp4_path: str = ""
 
-    delete: bool = False
+    deleted_at: datetime | None = None  # 删除时间，为空表示未删除
 
     user_id: int | None = Field(default=None, foreign_key="user_info.user_id")
 
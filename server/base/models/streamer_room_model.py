@@ -124,4 +124,5 @@ class ChatMessageInfo(SQLModel, table=True):
 
     role: str
     message: str
+    llm_message: str | None = None  # 实际发给 LLM 的内容（经 Agent / RAG 改写），为空则和 message 一致
     send_time: datetime | None = None
@@ -9,7 +9,7 @@ from loguru import logger
 from .delivery_time_query import DeliveryTimeQueryAction
 
 
-def init_handlers(departure_place, delivery_company_name):
+def init_protocol_handler():
     META_CN = "当开启工具以及代码时，根据需求选择合适的工具进行调用"
 
     INTERPRETER_CN = (
@@ -41,6 +41,19 @@ def init_handlers(departure_place, delivery_company_name):
             end="<|action_end|>\n",
         ),
     )
+
+    return protocol_handler
+
+
+# 协议模板和请求无关，只在加载时构建一次，所有请求复用
+PROTOCOL_HANDLER = init_protocol_handler()
+
+# Agent prompt 模板
+GENERATE_AGENT_TEMPLATE = "这是网上获取到的信息：“{}”\n 客户的问题：“{}” \n 请认真阅读信息并运用你的性格进行解答。"
+
+
+def init_handlers(departure_place, delivery_company_name):
+    # 只有 action 和商品的发货地、快递公司相关，每次请求重新生成
     action_list = [
         DeliveryTimeQueryAction(
             departure_place=departure_place,
@@ -52,7 +65,7 @@ def init_handlers(departure_place, delivery_company_name):
     plugin_action = [plugin_map[name] for name in plugin_name]
     action_executor = ActionExecutor(actions=plugin_action)
 
-    return action_executor, protocol_handler
+    return action_executor, PROTOCOL_HANDLER
 
 
 def get_agent_result(llm_model_handler, prompt_input, departure_place, delivery_company_name):
@@ -117,50 +130,42 @@ def get_agent_result(llm_model_handler, prompt_input, departure_place, delivery_
 
         logger.info(f"agent input for llm: {prompt}")
 
+        # 非流式推理：解码循环完全交给 LMDeploy 服务端执行，返回完整结果后只做一次解析，
+        # 避免逐 token 拼接字符串并重复调用 protocol_handler.parse
         model_name = llm_model_handler.available_models[0]
         for item in llm_model_handler.chat_completions_v1(
-            model=model_name, messages=prompt, stream=True, skip_special_tokens=False
+            model=model_name, messages=prompt, stream=False, skip_special_tokens=False
         ):
             # 从 prompt 推理结果例子：
             # '<|action_start|><|plugin|>\n{"name": "ArxivSearch.get_arxiv_article_information", "parameters": {"query": "InternLM2 Technical Report"}}<|action_end|>\n'
-
-            logger.info(f"agent return = {item}")
-            if "content" not in item["choices"][0]["delta"]:
-                continue
-            current_res = item["choices"][0]["delta"]["content"]
-
-            if "~" in current_res:
-                current_res = item.text.replace("~", "。").replace("。。", "。")
-
-            cur_response += current_res
-
             logger.info(f"agent return = {item}")
+            cur_response = item["choices"][0]["message"]["content"]
 
-            name, language, action = protocol_handler.parse(
-                message=cur_response,
-                plugin_executor=action_executor,
-                interpreter_executor=interpreter_executor,
-            )
-            if name:  # "plugin"
-                if name == "plugin":
-                    if action_executor:
-                        executor = action_executor
-                    else:
-                        logging.info(msg="No plugin is instantiated!")
-                        continue
-                    try:
-                        action = json.loads(action)
-                    except Exception as e:
-                        logging.info(msg=f"Invaild action {e}")
-                        continue
-                elif name == "interpreter":
-                    if interpreter_executor:
-                        executor = interpreter_executor
-                    else:
-                        logging.info(msg="No interpreter is instantiated!")
-                        continue
-                # agent_return.state = agent_state
-                agent_return.response = action
+        name, language, action = protocol_handler.parse(
+            message=cur_response,
+            plugin_executor=action_executor,
+            interpreter_executor=interpreter_executor,
+        )
+        if name:  # "plugin"
+            if name == "plugin":
+                if action_executor:
+                    executor = action_executor
+                else:
+                    logging.info(msg="No plugin is instantiated!")
+                    return ""
+                try:
+                    action = json.loads(action)
+                except Exception as e:
+                    logging.info(msg=f"Invaild action {e}")
+                    return ""
+            elif name == "interpreter":
+                if interpreter_executor:
+                    executor = interpreter_executor
+                else:
+                    logging.info(msg="No interpreter is instantiated!")
+                    return ""
+            # agent_return.state = agent_state
+            agent_return.response = action
 
         print(f"Agent response: {cur_response}")
 
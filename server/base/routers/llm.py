@@ -13,6 +13,7 @@
 from typing import Dict, List
 
 from fastapi import APIRouter, Depends
+from fastapi.concurrency import run_in_threadpool
 from loguru import logger
 
 from ..database.llm_db import get_llm_product_prompt_base_info
@@ -20,7 +21,7 @@ from ..database.product_db import get_db_product_info
 from ..database.streamer_info_db import get_db_streamer_info
 from ..models.product_model import ProductInfo
 from ..models.streamer_info_model import StreamerInfo
-from ..modules.agent.agent_worker import get_agent_result
+from ..modules.agent.agent_worker import GENERATE_AGENT_TEMPLATE, get_agent_result
 from ..server_info import SERVER_PLUGINS_INFO
 from ..utils import LLM_MODEL_HANDLER, ResultCode, make_return_data
 from .users import get_current_user_info
@@ -32,6 +33,10 @@ router = APIRouter(
 )
 
 
+# 对话记录角色 -> LLM 角色映射表
+ROLE_MAP = {"streamer": "assistant", "user": "user"}
+
+
 def combine_history(prompt: list, history_msg: list):
     """生成对话历史 prompt
 
@@ -42,12 +47,11 @@ def combine_history(prompt: list, history_msg: list):
     Returns:
         _type_: _description_
     """
-    # 角色映射表
-    role_map = {"streamer": "assistant", "user": "user"}
-
-    # 生成历史对话信息
-    for message in history_msg:
-        prompt.append({"role": role_map[message["role"]], "content": message["message"]})
+    # 生成历史对话信息，使用当时实际发给 LLM 的内容，保证每轮的 prompt 前缀一致，可以命中 LLM 服务端的 prefix cache
+    prompt.extend(
+        {"role": ROLE_MAP[message["role"]], "content": message.get("llm_message") or message["message"]}
+        for message in history_msg
+    )
 
     return prompt
 
@@ -121,11 +125,11 @@ async def get_agent_res(prompt, departure_place, delivery_company):
         # 如果不开启则直接返回空
         return ""
 
-    GENERATE_AGENT_TEMPLATE = (
-        "这是网上获取到的信息：“{}”\n 客户的问题：“{}” \n 请认真阅读信息并运用你的性格进行解答。"  # Agent prompt 模板
-    )
     input_prompt = prompt[-1]["content"]
-    agent_response = get_agent_result(LLM_MODEL_HANDLER, input_prompt, departure_place, delivery_company)
+    # Agent 内部是同步的 HTTP 请求，放到线程池执行，避免阻塞事件循环导致其他用户的请求被串行
+    agent_response = await run_in_threadpool(
+        get_agent_result, LLM_MODEL_HANDLER, input_prompt, departure_place, delivery_company
+    )
     if agent_response != "":
         agent_response = GENERATE_AGENT_TEMPLATE.format(agent_response, input_prompt)
         logger.info(f"Agent response: {agent_response}")
@@ -146,9 +150,14 @@ async def get_llm_res(prompt):
     logger.info(prompt)
     model_name = LLM_MODEL_HANDLER.available_models[0]
 
-    res_data = ""
-    for item in LLM_MODEL_HANDLER.chat_completions_v1(model=model_name, messages=prompt):
-        res_data = item["choices"][0]["message"]["content"]
+    def _chat_completions():
+        res_data = ""
+        for item in LLM_MODEL_HANDLER.chat_completions_v1(model=model_name, messages=prompt):
+            res_data = item["choices"][0]["message"]["content"]
+        return res_data
+
+    # APIClient 是同步的 HTTP 请求，放到线程池执行，让多个用户的请求可以同时发到 LLM 服务端进行 batch 推理
+    res_data = await run_in_threadpool(_chat_completions)
 
     return res_data
 
@@ -266,10 +266,7 @@ async def get_on_air_live_room_api(room_chat: RoomChatItem, user_id: int = Depen
     # 销售 ID
     sales_info_id = streaming_room_info.product_list[streaming_room_info.status.current_product_index].sales_info_id
 
-    # 更新对话记录
-    update_message_info(sales_info_id, user_id, role="user", message=room_chat.message)
-
-    # 获取最新的对话记录
+    # 获取历史对话记录
     conversation_list = get_message_list(sales_info_id)
 
     # 根据对话记录生成 prompt
@@ -280,6 +277,7 @@ async def get_on_air_live_room_api(room_chat: RoomChatItem, user_id: int = Depen
     )  # system + 获取商品文案prompt
 
     prompt = combine_history(prompt, conversation_list)
+    prompt.append({"role": "user", "content": room_chat.message})  # 本轮用户输入
 
     # ====================== Agent ======================
     # 调取 Agent
@@ -297,6 +295,10 @@ async def get_on_air_live_room_api(room_chat: RoomChatItem, user_id: int = Depen
         if rag_res != "":
             prompt[-1]["content"] = rag_res
 
+    # 更新对话记录，同时保存 Agent / RAG 改写后的内容，后续轮次的历史对话使用改写后的内容
+    llm_message = prompt[-1]["content"] if prompt[-1]["content"] != room_chat.message else None
+    update_message_info(sales_info_id, user_id, role="user", message=room_chat.message, llm_message=llm_message)
+
     # 调取 LLM
     streamer_res = await get_llm_res(prompt)
 
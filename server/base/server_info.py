@@ -17,6 +17,31 @@ from loguru import logger
 from ..web_configs import API_CONFIG, WEB_CONFIGS
 
 
+# 头像颜色候选，模块加载时构建一次
+AVATAR_COLORS = (
+    "#FF3838",
+    "#FF9D97",
+    "#FF701F",
+    "#FFB21D",
+    "#CFD231",
+    "#48F90A",
+    "#92CC17",
+    "#3DDB86",
+    "#1A9334",
+    "#00D4BB",
+    "#2C99A8",
+    "#00C2FF",
+    "#344593",
+    "#6473FF",
+    "#0018EC",
+    "#8438FF",
+    "#520085",
+    "#CB38FF",
+    "#FF95C8",
+    "#FF37C7",
+)
+
+
 class ServerPluginsInfo:
 
     def __init__(self) -> None:
@@ -61,31 +86,7 @@ class ServerPluginsInfo:
 
     @staticmethod
     def _make_color_list(color_num):
-
-        color_list = [
-            "#FF3838",
-            "#FF9D97",
-            "#FF701F",
-            "#FFB21D",
-            "#CFD231",
-            "#48F90A",
-            "#92CC17",
-            "#3DDB86",
-            "#1A9334",
-            "#00D4BB",
-            "#2C99A8",
-            "#00C2FF",
-            "#344593",
-            "#6473FF",
-            "#0018EC",
-            "#8438FF",
-            "#520085",
-            "#CB38FF",
-            "#FF95C8",
-            "#FF37C7",
-        ]
-
-        return random.sample(color_list, color_num)
+        return random.sample(AVATAR_COLORS, color_num)
 
     def get_status(self):
         self.update_info()
@@ -22,6 +22,7 @@ from typing import Dict, List
 
 import cv2
 from lmdeploy.serve.openai.api_client import APIClient
+from fastapi.concurrency import iterate_in_threadpool, run_in_threadpool
 from loguru import logger
 from pydantic import BaseModel
 from sqlmodel import Session, select
@@ -36,7 +37,7 @@ from .models.product_model import ProductInfo
 from .models.streamer_info_model import StreamerInfo
 from .models.streamer_room_model import OnAirRoomStatusItem, SalesDocAndVideoInfo, StreamRoomInfo
 
-from .modules.agent.agent_worker import get_agent_result
+from .modules.agent.agent_worker import GENERATE_AGENT_TEMPLATE, get_agent_result
 from .modules.rag.rag_worker import RAG_RETRIEVER, build_rag_prompt
 from .queue_thread import DIGITAL_HUMAN_QUENE, TTS_TEXT_QUENE
 from .server_info import SERVER_PLUGINS_INFO
@@ -85,12 +86,13 @@ async def streamer_sales_process(chat_item: ChatItem):
     # 调取 Agent
     agent_response = ""
     if chat_item.plugins.agent and SERVER_PLUGINS_INFO.agent_enabled:
-        GENERATE_AGENT_TEMPLATE = (
-            "这是网上获取到的信息：“{}”\n 客户的问题：“{}” \n 请认真阅读信息并运用你的性格进行解答。"  # Agent prompt 模板
-        )
         input_prompt = chat_item.prompt[-1]["content"]
-        agent_response = get_agent_result(
-            LLM_MODEL_HANDLER, input_prompt, chat_item.product_info.departure_place, chat_item.product_info.delivery_company_name
+        agent_response = await run_in_threadpool(
+            get_agent_result,
+            LLM_MODEL_HANDLER,
+            input_prompt,
+            chat_item.product_info.departure_place,
+            chat_item.product_info.delivery_company_name,
         )
         if agent_response != "":
             agent_response = GENERATE_AGENT_TEMPLATE.format(agent_response, input_prompt)
@@ -115,7 +117,9 @@ async def streamer_sales_process(chat_item: ChatItem):
     last_text_index = 0
     sentence_id = 0
     model_name = LLM_MODEL_HANDLER.available_models[0]
-    for item in LLM_MODEL_HANDLER.chat_completions_v1(model=model_name, messages=chat_item.prompt, stream=True):
+    # APIClient 的流式返回是同步生成器，放到线程池中迭代，避免阻塞事件循环导致多个用户的请求被串行
+    llm_stream = LLM_MODEL_HANDLER.chat_completions_v1(model=model_name, messages=chat_item.prompt, stream=True)
+    async for item in iterate_in_threadpool(llm_stream):
         logger.debug(f"LLM predict: {item}")
         if "content" not in item["choices"][0]["delta"]:
             continue
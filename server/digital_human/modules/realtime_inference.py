@@ -188,8 +188,34 @@ class Avatar:
         self.vae.vae = self.vae.vae.half()
         self.unet.model = self.unet.model.half()
 
+        if WEB_CONFIGS.DIGITAL_HUMAN_TORCH_COMPILE:
+            # 编译 UNet 前向，融合逐元素算子、减少 kernel launch 开销。模型只在这里编译一次，后续请求复用，
+            # 推理时最后一个不足 batch_size 的 batch 会补齐到 batch_size，保证输入形状固定，编译出的图可以一直复用
+            logger.info("Compiling digital human unet with torch.compile ...")
+            self.unet.model = torch.compile(self.unet.model, dynamic=False)
+
         self.change_character(avatar_id)
 
+        if WEB_CONFIGS.DIGITAL_HUMAN_TORCH_COMPILE:
+            # 加载时先跑一次触发编译，避免第一个用户请求承担编译耗时
+            self.warmup_unet()
+
+    def warmup_unet(self):
+        """用固定 batch_size 的假数据跑一次 UNet 前向，触发 torch.compile 编译"""
+        logger.info("Warming up compiled digital human unet ...")
+        start_time = time.time()
+
+        latent_batch = self.input_latent_list_cycle[0].repeat(self.batch_size, 1, 1, 1).to(dtype=self.unet.model.dtype)
+        audio_feature_batch = torch.zeros(
+            (self.batch_size, 50, 384), device=self.unet.device, dtype=self.unet.model.dtype
+        )  # whisper chunk 为 50*384
+        audio_feature_batch = self.pe(audio_feature_batch)
+
+        timesteps = torch.tensor([0], device="cuda")
+        self.unet.model(latent_batch, timesteps, encoder_hidden_states=audio_feature_batch)
+
+        logger.info(f"Warm up digital human unet costs {time.time() - start_time:.2f}s")
+
     def change_character(self, avatar_id, video_path=""):
 
         if video_path != "":
@@ -376,9 +402,16 @@ class Avatar:
             audio_feature_batch = self.pe(audio_feature_batch)
             latent_batch = latent_batch.to(dtype=self.unet.model.dtype)
 
+            real_batch_size = latent_batch.shape[0]
+            if WEB_CONFIGS.DIGITAL_HUMAN_TORCH_COMPILE and real_batch_size < self.batch_size:
+                # 最后一个 batch 不足 batch_size，用最后一帧补齐，保持编译后的输入形状不变，避免请求中重新编译
+                pad_num = self.batch_size - real_batch_size
+                latent_batch = torch.cat([latent_batch, latent_batch[-1:].repeat(pad_num, 1, 1, 1)], dim=0)
+                audio_feature_batch = torch.cat([audio_feature_batch, audio_feature_batch[-1:].repeat(pad_num, 1, 1)], dim=0)
+
             timesteps = torch.tensor([0], device="cuda")
             pred_latents = self.unet.model(latent_batch, timesteps, encoder_hidden_states=audio_feature_batch).sample
-            recon = self.vae.decode_latents(pred_latents)
+            recon = self.vae.decode_latents(pred_latents[:real_batch_size])  # 去掉补齐的部分
             for res_frame in recon:
                 res_frame_queue.put(res_frame)
         # Close the queue and sub-thread after all tasks are completed
@@ -274,7 +274,8 @@ class Text2SemanticDecoder(nn.Module):
                 print("use early stop num:", early_stop_num)
                 stop = True
 
-            if torch.argmax(logits, dim=-1)[0] == self.EOS or samples[0, 0] == self.EOS:
+            # argmax 和采样结果任一为 EOS 即结束，合并成一次张量判断，每步只做一次 GPU -> CPU 同步
+            if ((torch.argmax(logits, dim=-1)[0] == self.EOS) | (samples[0, 0] == self.EOS)).item():
                 # print(torch.argmax(logits, dim=-1)[0] == self.EOS, samples[0, 0] == self.EOS)
                 stop = True
             if stop:
@@ -322,7 +323,6 @@ class Text2SemanticDecoder(nn.Module):
             "k": [None] * self.num_layers,  ###根据配置自己手写
             "v": [None] * self.num_layers,
             # "xy_pos":None,##y_pos位置编码每次都不一样的没法缓存，每次都要重新拼xy_pos.主要还是写法原因，其实是可以历史统一一样的，但也没啥计算量就不管了
-            "y_emb": None,  ##只需要对最新的samples求emb，再拼历史的就行
             # "logits":None,###原版就已经只对结尾求再拼接了，不用管
             # "xy_dec":None,###不需要，本来只需要最后一个做logits
             "first_infer": 1,
@@ -335,7 +335,6 @@ class Text2SemanticDecoder(nn.Module):
             prefix_len = y.shape[1]
             y_pos = self.ar_audio_position(y_emb)
             xy_pos = torch.concat([x, y_pos], dim=1)
-            cache["y_emb"] = y_emb
             ref_free = False
         else:
             y_emb = None
@@ -358,25 +357,36 @@ class Text2SemanticDecoder(nn.Module):
         )
         xy_attn_mask = torch.concat([x_attn_mask_pad, y_attn_mask], dim=0).to(x.device)
 
-        for idx in tqdm(range(1500)):
+        # 预先分配好输出 buffer，每步只写入一个位置，避免每步 torch.concat 重新分配并拷贝整段 y
+        max_decode_len = 1500
+        y_buf = torch.empty((y.shape[0], y.shape[1] + max_decode_len), dtype=y.dtype, device=y.device)
+        y_buf[:, : y.shape[1]] = y
+        y = y_buf[:, : y.shape[1]]
+
+        ###################  prefill ##########################
+        # 文本 + 参考音频 token 只在这里整段过一次模型，填充 KV cache，之后的 decode 循环每步输入都固定为 1 帧
+        xy_dec, _ = self.h((xy_pos, None), mask=xy_attn_mask, cache=cache)
+        cache["first_infer"] = 0
+        logits = self.ar_predict_layer(xy_dec[:, -1])
+        logits = logits[:, :-1]  ###第一次跑不能EOS否则没有了，刨除1024终止符号的概率
+
+        for idx in tqdm(range(max_decode_len)):
 
-            xy_dec, _ = self.h((xy_pos, None), mask=xy_attn_mask, cache=cache)
-            logits = self.ar_predict_layer(xy_dec[:, -1])  ##不用改，如果用了cache的默认就是只有一帧，取最后一帧一样的
             # samples = topk_sampling(logits, top_k=top_k, top_p=1.0, temperature=temperature)
-            if idx == 0:  ###第一次跑不能EOS否则没有了
-                logits = logits[:, :-1]  ###刨除1024终止符号的概率
             samples = sample(logits[0], y, top_k=top_k, top_p=top_p, repetition_penalty=1.35, temperature=temperature)[
                 0
             ].unsqueeze(0)
             # 本次生成的 semantic_ids 和之前的 y 构成新的 y
             # print(samples.shape)#[1,1]#第一个1是bs
-            y = torch.concat([y, samples], dim=1)
+            y_buf[:, y.shape[1]] = samples[:, 0]
+            y = y_buf[:, : y.shape[1] + 1]
 
             if early_stop_num != -1 and (y.shape[1] - prefix_len) > early_stop_num:
                 print("use early stop num:", early_stop_num)
                 stop = True
 
-            if torch.argmax(logits, dim=-1)[0] == self.EOS or samples[0, 0] == self.EOS:
+            # argmax 和采样结果任一为 EOS 即结束，合并成一次张量判断，每步只做一次 GPU -> CPU 同步
+            if ((torch.argmax(logits, dim=-1)[0] == self.EOS) | (samples[0, 0] == self.EOS)).item():
                 # print(torch.argmax(logits, dim=-1)[0] == self.EOS, samples[0, 0] == self.EOS)
                 stop = True
             if stop:
@@ -389,25 +399,19 @@ class Text2SemanticDecoder(nn.Module):
                 print(f"T2S Decoding EOS [{prefix_len} -> {y.shape[1]}]")
                 break
 
-            ####################### update next step ###################################
-            cache["first_infer"] = 0
-            if cache["y_emb"] is not None:
-                y_emb = torch.cat([cache["y_emb"], self.ar_audio_embedding(y[:, -1:])], dim=1)
-                cache["y_emb"] = y_emb
-                y_pos = self.ar_audio_position(y_emb)
-                xy_pos = y_pos[:, -1:]
-            else:
-                y_emb = self.ar_audio_embedding(y[:, -1:])
-                cache["y_emb"] = y_emb
-                y_pos = self.ar_audio_position(y_emb)
-                xy_pos = y_pos
-            y_len = y_pos.shape[1]
+            ####################### decode next step ###################################
+            # 只对最新的一帧求 emb 和位置编码，不再把历史 y_emb 拼接后整段重算，每步开销从 O(T) 降到 O(1)
+            xy_pos = self.ar_audio_position.forward_step(self.ar_audio_embedding(y[:, -1:]), y_len)
+            y_len += 1
 
             ###最右边一列（是错的）
             # xy_attn_mask=torch.ones((1, x_len+y_len), dtype=torch.bool,device=xy_pos.device)
             # xy_attn_mask[:,-1]=False
             ###最下面一行（是对的）
             xy_attn_mask = torch.zeros((1, x_len + y_len), dtype=torch.bool, device=xy_pos.device)
+
+            xy_dec, _ = self.h((xy_pos, None), mask=xy_attn_mask, cache=cache)
+            logits = self.ar_predict_layer(xy_dec[:, -1])  ##decode 阶段输入只有一帧，取最后一帧即可
         if ref_free:
             return y[:, :-1], 0
         return y[:, :-1], idx - 1
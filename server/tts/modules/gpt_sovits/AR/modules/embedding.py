@@ -79,3 +79,12 @@ class SinePositionalEmbedding(nn.Module):
         output = x.unsqueeze(-1) if x.ndim == 2 else x
         output = output * self.x_scale + self.alpha * self.pe[:, : x.size(1)]
         return self.dropout(output)
+
+    def forward_step(self, x: torch.Tensor, position: int) -> torch.Tensor:
+        """Positional encoding of a single frame at `position`, for incremental decoding."""
+        assert not self.reverse
+        self.extend_pe(x)
+        if self.pe.size(1) <= position:
+            self.extend_pe(x.new_empty(1, position + 1))
+        output = x * self.x_scale + self.alpha * self.pe[:, position : position + 1]
+        return self.dropout(output)
@@ -85,6 +85,9 @@ class WebConfigs:
     DIGITAL_HUMAN_VIDEO_OUTPUT_PATH: str = rf"{SERVER_FILE_ROOT}/{STREAMER_FILE_DIR}/vid_output"
 
     DIGITAL_HUMAN_FPS: str = 25
+    DIGITAL_HUMAN_TORCH_COMPILE: bool = (
+        os.environ.get("DIGITAL_HUMAN_TORCH_COMPILE", "false") == "true"
+    )  # True 使用 torch.compile 编译 UNet 加速推理，服务启动时会进行编译和预热，启动耗时变长
 
     # ==================================================================
     #                             Agent 配置